@@ -10,133 +10,319 @@ Date: 2025-11-09
 Licence: CC-BY-NC-4.0
 
 Utilisation:
-    python mgd.py
+    python mgd.py
 """
 
-from itertools import product
+from collections import Counter
+from fractions import Fraction
+from functools import lru_cache
+from itertools import chain, combinations_with_replacement, product
+
+
+# Structure C27 figée: produit cartésien {0,1,2}³, construit une seule fois.
+_CUBE_27 = tuple(product(range(3), repeat=3))
+
+
+@lru_cache(maxsize=2)
+def _analyse_cube_27(exact=False):
+    """
+    Analyse de C27, déterministe: calculée une seule fois par mode.
+    La règle ne dépend que de p1[1] et de p2[0]: on compte les points par
+    valeur de chaque coordonnée au lieu de tester les 729 paires.
+    """
+    par_antithese = Counter(p[1] for p in _CUBE_27)
+    par_these = Counter(p[0] for p in _CUBE_27)
+    
+    valid_anchors = sum(par_antithese[k] * par_these[k]
+                        for k in par_antithese)
+    total_pairs = len(_CUBE_27) ** 2
+    
+    if exact:
+        ratio = Fraction(valid_anchors * 100, total_pairs)
+    else:
+        ratio = (valid_anchors / total_pairs) * 100
+    
+    return {
+        'nombre_points': len(_CUBE_27),
+        'total_paires': total_pairs,
+        'ancrages_valides': valid_anchors,
+        'ratio_percentage': ratio
+    }
+
+
+# États de base canoniques (thèse, antithèse, synthèse).
+_ETATS_DE_BASE = ((1, 0, 0), (0, 1, 0), (0, 0, 1))
+
+
+# Un état (t, a, s) est empaqueté dans un seul entier, 20 bits par
+# composante: un hash d'entier au lieu d'un hash de tuple. Chaque itération
+# au plus double max(t + a, s); si les composantes peuvent sortir de
+# [0, 2^20), generer_hybridations reste sur des tuples (_expandir_tuples).
+_BITS = 20
+_MASQUE = (1 << _BITS) - 1
+
+
+def _empaqueter(v):
+    """(t, a, s) → t·2^40 + a·2^20 + s"""
+    t, a, s = v
+    return (t << 2 * _BITS) | (a << _BITS) | s
+
+
+def _depaqueter(k):
+    """t·2^40 + a·2^20 + s → (t, a, s)"""
+    return (k >> 2 * _BITS, (k >> _BITS) & _MASQUE, k & _MASQUE)
+
+
+def _regrouper(etats):
+    """
+    Regroupe les états empaquetés par composantes (t, a).
+    Chaque groupe: (clé (t, a, 0) empaquetée, t + a, s_min, s_max,
+    valeurs de s, contigu).
+    """
+    groupes = {}
+    for k in etats:
+        groupes.setdefault(k & ~_MASQUE, set()).add(k & _MASQUE)
+    return [(cle, (cle >> 2 * _BITS) + ((cle >> _BITS) & _MASQUE),
+             min(v), max(v), v, max(v) - min(v) + 1 == len(v))
+            for cle, v in groupes.items()]
+
+
+def _expandir_etats(frontiere, etats):
+    """
+    Noyau de génération: hybride et résout les paires d'états empaquetés.
+    Retourne uniquement les états stables absents de `etats`.
+    
+    Seules les paires touchant la `frontiere` (états apparus à l'itération
+    précédente) sont évaluées: les paires d'états plus anciens l'ont déjà
+    été, chaque paire n'est donc calculée qu'une seule fois.
+    
+    Les états sont regroupés par (t, a): toutes les paires de deux groupes
+    donnent le même (t, a) et des synthèses comprises entre `bas` et `haut`.
+    Un couple de groupes est ignoré si ce (t, a) couvre déjà toute la plage;
+    si les deux groupes sont des intervalles, la plage est notée
+    directement, sans parcourir les paires.
+    """
+    satures = {cle: (s_min, s_max)
+               for cle, _, s_min, s_max, _, contigu in _regrouper(etats)
+               if contigu}
+    groupes_frontiere = _regrouper(frontiere)
+    couples = chain(combinations_with_replacement(groupes_frontiere, 2),
+                    product(groupes_frontiere, _regrouper(etats - frontiere)))
+    
+    nouveaux = set()
+    # Plages [bas, haut] produites par couple, regroupées par (t, a) puis
+    # fusionnées: chaque état n'est inséré qu'une fois, au lieu d'une fois
+    # par couple qui le produit.
+    plages = {}
+    # Méthodes liées une fois pour toutes: pas de recherche d'attribut
+    # à chaque couple.
+    ajouter = nouveaux.update
+    plage_connue = satures.get
+    noter_plage = plages.setdefault
+    for (cle1, n1, min1, max1, valeurs1, contigu1), \
+            (cle2, n2, min2, max2, valeurs2, contigu2) in couples:
+        # L'hybridation des clés est une simple addition d'entiers.
+        cle = cle1 + cle2
+        m = n1 + n2
+        # max(s, t+a) écrit en expression conditionnelle: évite l'appel au
+        # builtin max. Si les deux groupes sont équilibrés (s1 ≥ n1 et
+        # s2 ≥ n2), s1 + s2 ≥ m et Σ est l'identité: seules les paires
+        # touchant la thèse ou l'antithèse de base sont réellement résolues.
+        s_bas = min1 + min2
+        bas = s_bas if s_bas >= m else m
+        s_haut = max1 + max2
+        haut = s_haut if s_haut >= m else m
+        
+        plage = plage_connue(cle)
+        if plage is not None and plage[0] <= bas and haut <= plage[1]:
+            continue
+        
+        if contigu1 and contigu2:
+            noter_plage(cle, []).append((bas, haut))
+        else:
+            for s1 in valeurs1:
+                for s2 in valeurs2:
+                    s = s1 + s2
+                    nouveaux.add(cle + (s if s >= m else m))
+    
+    for cle, intervalles in plages.items():
+        intervalles.sort()
+        bas, haut = intervalles[0]
+        for b, h in intervalles:
+            if b > haut + 1:
+                ajouter(range(cle + bas, cle + haut + 1))
+                bas = b
+            if h > haut:
+                haut = h
+        ajouter(range(cle + bas, cle + haut + 1))
+    
+    return nouveaux - etats
+
+
+def _expandir_tuples(frontiere, etats):
+    """
+    Noyau de repli sur des tuples (t, a, s), sans borne sur les composantes:
+    utilisé quand les états ne tiennent pas dans l'empaquetage.
+    Comme _expandir_etats, seules les paires touchant la `frontiere` sont
+    évaluées.
+    """
+    paires = chain(combinations_with_replacement(frontiere, 2),
+                   product(frontiere, etats - frontiere))
+    nouveaux = set()
+    for (t1, a1, s1), (t2, a2, s2) in paires:
+        t = t1 + t2
+        a = a1 + a2
+        s = s1 + s2
+        m = t + a
+        nouveaux.add((t, a, s if s >= m else m))
+    return nouveaux - etats
+
 
 class MGDMoteur:
-    """
-    Moteur du Modèle Génératif Dialectique.
-    Implémente les trois opérateurs: Hybridation, Résolution, Récursion.
-    """
-    
-    def __init__(self):
-        """Initialise le moteur avec les trois états de base."""
-        self.M_THESE = (1, 0, 0)
-        self.M_ANTITHESE = (0, 1, 0)
-        self.M_SYNTHESE = (0, 0, 1)
-    
-    def verifier_axiome(self, t, a, s):
-        """
-        Vérifie si une proposition est équilibrée.
-        Axiome: S ≥ T + A
-        """
-        return s >= (t + a)
-    
-    def hybridation(self, v1, v2):
-        """
-        Opérateur d'hybridation: mélange deux vecteurs dialectiques.
-        Résultat: addition vectorielle composante par composante.
-        """
-        return tuple(x + y for x, y in zip(v1, v2))
-    
-    def resolution(self, v):
-        """
-        Opérateur de résolution: transforme un état instable en équilibré.
-        Formule: Σ(v) = (t, a, max(s, t+a))
-        """
-        t, a, s = v
-        s_min = t + a
-        return (t, a, max(s, s_min))
-    
-    def generer_hybridations(self, max_iterations=5, verbose=False):
-        """
-        Génère une infinité d'états par hybridation répétée.
-        """
-        all_states = {self.M_THESE, self.M_ANTITHESE, self.M_SYNTHESE}
-        history = []
-        
-        for iteration in range(max_iterations):
-            new_states = set()
-            state_list = list(all_states)
-            
-            for i, s1 in enumerate(state_list):
-                for s2 in state_list[i:]:
-                    hybrid = self.hybridation(s1, s2)
-                    resolved = self.resolution(hybrid)
-                    
-                    if resolved not in all_states:
-                        new_states.add(resolved)
-            
-            all_states.update(new_states)
-            history.append(len(new_states))
-            
-            if verbose:
-                print(f"  Itération {iteration+1}: "
-                      f"{len(new_states)} nouveaux états | "
-                      f"Total: {len(all_states)}")
-            
-            if len(new_states) == 0:
-                if verbose:
-                    print(f"  → Génération stabilisée")
-                break
-        
-        return history, all_states
-    
-    def generer_cube_27(self):
-        """
-        Génère la structure C27: cube 3×3×3.
-        C27 = produit cartésien {0,1,2} × {0,1,2} × {0,1,2}
-        """
-        return list(product(range(3), repeat=3))
-    
-    def ancrage_valide(self, v1, v2):
-        """
-        Vérifie la règle d'ancrage pour enchâssement récursif.
-        Règle: ℛ(v1, v2) valide ssi v1[1] == v2[0]
-        """
-        return v1[1] == v2[0]
-    
-    def analyser_cube_27(self):
-        """
-        Analyse la structure du cube C27 et les ancrages.
-        """
-        cube = self.generer_cube_27()
-        
-        valid_anchors = 0
-        total_pairs = len(cube) ** 2
-        
-        for p1 in cube:
-            for p2 in cube:
-                if self.ancrage_valide(p1, p2):
-                    valid_anchors += 1
-        
-        ratio = (valid_anchors / total_pairs) * 100
-        
-        return {
-            'nombre_points': len(cube),
-            'total_paires': total_pairs,
-            'ancrages_valides': valid_anchors,
-            'ratio_percentage': ratio
-        }
-    
-    def generer_triade_poetique(self, v1, v2, concepts=None):
-        """
-        Génère une triade poétique via hybridation + résolution.
-        """
-        hybrid = self.hybridation(v1, v2)
-        resolved = self.resolution(hybrid)
-        
-        result = {
-            'concept_1': concepts.get(v1, str(v1)) if concepts else str(v1),
-            'concept_2': concepts.get(v2, str(v2)) if concepts else str(v2),
-            'tension': hybrid,
-            'synthese': resolved,
-            'equilibre': self.verifier_axiome(*resolved)
-        }
-        
-        return result
+    """
+    Moteur du Modèle Génératif Dialectique.
+    Implémente les trois opérateurs: Hybridation, Résolution, Récursion.
+    """
+    
+    def __init__(self):
+        """Initialise le moteur avec les trois états de base."""
+        self.M_THESE = (1, 0, 0)
+        self.M_ANTITHESE = (0, 1, 0)
+        self.M_SYNTHESE = (0, 0, 1)
+    
+    def verifier_axiome(self, t, a, s):
+        """
+        Vérifie si une proposition est équilibrée.
+        Axiome: S ≥ T + A
+        """
+        return s >= (t + a)
+    
+    def hybridation(self, v1, v2):
+        """
+        Opérateur d'hybridation: mélange deux vecteurs dialectiques.
+        Résultat: addition vectorielle composante par composante.
+        """
+        return (v1[0] + v2[0], v1[1] + v2[1], v1[2] + v2[2])
+    
+    def resolution(self, v):
+        """
+        Opérateur de résolution: transforme un état instable en équilibré.
+        Formule: Σ(v) = (t, a, max(s, t+a))
+        """
+        t, a, s = v
+        s_min = t + a
+        return (t, a, s if s >= s_min else s_min)
+    
+    def generer_hybridations(self, max_iterations=5, verbose=False):
+        """
+        Génère une infinité d'états par hybridation répétée.
+        """
+        graines = {tuple(self.M_THESE), tuple(self.M_ANTITHESE),
+                   tuple(self.M_SYNTHESE)}
+        # Empaquetage seulement si toutes les composantes restent dans
+        # [0, 2^20) jusqu'à la dernière itération; sinon, tuples.
+        empaquete = (all(c >= 0 for v in graines for c in v)
+                     and max(max(t + a, s) for t, a, s in graines)
+                     << max(max_iterations, 0) <= _MASQUE)
+        if empaquete:
+            all_states = set(map(_empaqueter, graines))
+            expandir = _expandir_etats
+        else:
+            all_states = graines
+            expandir = _expandir_tuples
+        history = []
+        frontier = set(all_states)
+        
+        for iteration in range(max_iterations):
+            new_states = expandir(frontier, all_states)
+            all_states |= new_states
+            frontier = new_states
+            history.append(len(new_states))
+            
+            if verbose:
+                print(f"  Itération {iteration+1}: "
+                      f"{len(new_states)} nouveaux états | "
+                      f"Total: {len(all_states)}")
+            
+            if len(new_states) == 0:
+                if verbose:
+                    print(f"  → Génération stabilisée")
+                break
+        
+        if empaquete:
+            all_states = set(map(_depaqueter, all_states))
+        return history, all_states
+    
+    def etats_atteignables(self, profondeur):
+        """
+        Forme close de generer_hybridations: mêmes états, sans balayage des
+        paires. Avec B = 2^profondeur et n = t + a, les états atteints sont
+        la thèse, l'antithèse et tous les (t, a, s) tels que
+        max(n, 1) ≤ s ≤ B - (n mod 2).
+        La formule suppose les états de base canoniques (1,0,0), (0,1,0)
+        et (0,0,1).
+        """
+        if profondeur < 0:
+            raise ValueError("La profondeur doit être positive ou nulle")
+        if (self.M_THESE, self.M_ANTITHESE, self.M_SYNTHESE) != _ETATS_DE_BASE:
+            raise ValueError("Forme close valable uniquement pour les états "
+                             "de base (1,0,0), (0,1,0), (0,0,1)")
+        
+        borne = 1 << profondeur
+        etats = {(1, 0, 0), (0, 1, 0)}
+        for t in range(borne + 1):
+            for a in range(borne + 1 - t):
+                n = t + a
+                etats.update((t, a, s)
+                             for s in range(max(n, 1), borne - (n & 1) + 1))
+        return etats
+    
+    def iter_cube_27(self):
+        """
+        Parcourt la structure C27 sans construire de liste.
+        Les 27 points sont ceux de la constante _CUBE_27, partagée.
+        """
+        return iter(_CUBE_27)
+    
+    def generer_cube_27(self):
+        """
+        Génère la structure C27: cube 3×3×3.
+        C27 = produit cartésien {0,1,2} × {0,1,2} × {0,1,2}
+        """
+        return list(self.iter_cube_27())
+    
+    def ancrage_valide(self, v1, v2):
+        """
+        Vérifie la règle d'ancrage pour enchâssement récursif.
+        Règle: ℛ(v1, v2) valide ssi v1[1] == v2[0]
+        """
+        return v1[1] == v2[0]
+    
+    def analyser_cube_27(self, exact=False):
+        """
+        Analyse la structure du cube C27 et les ancrages.
+        Avec exact=True, le ratio est une Fraction exacte.
+        """
+        # Copie: le résultat mis en cache ne doit pas être modifié.
+        return dict(_analyse_cube_27(exact))
+    
+    def generer_triade_poetique(self, v1, v2, concepts=None):
+        """
+        Génère une triade poétique via hybridation + résolution.
+        """
+        hybrid = self.hybridation(v1, v2)
+        resolved = self.resolution(hybrid)
+        
+        result = {
+            'concept_1': concepts.get(v1, str(v1)) if concepts else str(v1),
+            'concept_2': concepts.get(v2, str(v2)) if concepts else str(v2),
+            'tension': hybrid,
+            'synthese': resolved,
+            # Axiome S ≥ T + A testé en place, sans dépaquetage ni appel.
+            'equilibre': resolved[2] >= resolved[0] + resolved[1]
+        }
+        
+        return result
 
 
 # ============================================================
@@ -144,76 +330,78 @@ class MGDMoteur:
 # ============================================================
 
 if __name__ == "__main__":
-    print("="*70)
-    print("MGD (Modèle Génératif Dialectique) - Exécution complète")
-    print("Auteur: Kenny Lefevre")
-    print("="*70)
-    
-    moteur = MGDMoteur()
-    
-    # TEST 1: Hybridation et Résolution
-    print("\n[TEST 1] Hybridation simple")
-    print("-"*70)
-    
-    v1 = moteur.M_THESE
-    v2 = moteur.M_ANTITHESE
-    
-    print(f"Thèse:      {v1}")
-    print(f"Antithèse:  {v2}")
-    
-    hybrid = moteur.hybridation(v1, v2)
-    print(f"\nHybridation (tension):")
-    print(f"  {v1} ⊕ {v2} = {hybrid}")
-    print(f"  Équilibré? {moteur.verifier_axiome(*hybrid)}")
-    
-    resolved = moteur.resolution(hybrid)
-    print(f"\nRésolution (équilibre):")
-    print(f"  Σ({hybrid}) = {resolved}")
-    print(f"  Équilibré? {moteur.verifier_axiome(*resolved)} ✓")
-    
-    # TEST 2: Génération d'infini
-    print("\n\n[TEST 2] Génération d'infini par hybridation (5 itérations)")
-    print("-"*70)
-    
-    history, all_states = moteur.generer_hybridations(max_iterations=5, verbose=True)
-    
-    print(f"\nRésumé:")
-    for i, count in enumerate(history, 1):
-        print(f"  Itération {i}: {count} nouveaux états")
-    print(f"  Total: {len(all_states)} états uniques")
-    
-    # TEST 3: Cube C27
-    print("\n\n[TEST 3] Structure C27 et Ancrage")
-    print("-"*70)
-    
-    stats = moteur.analyser_cube_27()
-    print(f"\nCube 3×3×3:")
-    print(f"  Points: {stats['nombre_points']}")
-    print(f"  Paires d'ancrage valides: {stats['ancrages_valides']}/{stats['total_paires']}")
-    print(f"  Ratio: {stats['ratio_percentage']:.2f}%")
-    
-    # TEST 4: Application poétique
-    print("\n\n[TEST 4] Triade poétique")
-    print("-"*70)
-    
-    concepts = {
-        (1, 0, 0): "Interrogation",
-        (0, 1, 0): "Négation",
-        (0, 0, 1): "Affirmation"
-    }
-    
-    triade = moteur.generer_triade_poetique(
-        moteur.M_THESE,
-        moteur.M_ANTITHESE,
-        concepts
-    )
-    
-    print(f"\nConcept 1: {triade['concept_1']}")
-    print(f"Concept 2: {triade['concept_2']}")
-    print(f"État de tension: {triade['tension']}")
-    print(f"État de synthèse: {triade['synthese']}")
-    print(f"Équilibré? {triade['equilibre']} ✓")
-    
-    print("\n" + "="*70)
-    print("✓ Tous les tests réussis!")
-    print("="*70)
+    print("="*70)
+    print("MGD (Modèle Génératif Dialectique) - Exécution complète")
+    print("Auteur: Kenny Lefevre")
+    print("="*70)
+    
+    moteur = MGDMoteur()
+    
+    # TEST 1: Hybridation et Résolution
+    print("\n[TEST 1] Hybridation simple")
+    print("-"*70)
+    
+    v1 = moteur.M_THESE
+    v2 = moteur.M_ANTITHESE
+    
+    print(f"Thèse:      {v1}")
+    print(f"Antithèse:  {v2}")
+    
+    hybrid = moteur.hybridation(v1, v2)
+    print(f"\nHybridation (tension):")
+    print(f"  {v1} ⊕ {v2} = {hybrid}")
+    print(f"  Équilibré? {moteur.verifier_axiome(*hybrid)}")
+    
+    resolved = moteur.resolution(hybrid)
+    print(f"\nRésolution (équilibre):")
+    print(f"  Σ({hybrid}) = {resolved}")
+    print(f"  Équilibré? {moteur.verifier_axiome(*resolved)} ✓")
+    
+    # TEST 2: Génération d'infini
+    print("\n\n[TEST 2] Génération d'infini par hybridation (5 itérations)")
+    print("-"*70)
+    
+    history, all_states = moteur.generer_hybridations(max_iterations=5, verbose=True)
+    
+    print(f"\nRésumé:")
+    for i, count in enumerate(history, 1):
+        print(f"  Itération {i}: {count} nouveaux états")
+    print(f"  Total: {len(all_states)} états uniques")
+    print(f"  Forme close identique? "
+          f"{moteur.etats_atteignables(len(history)) == all_states} ✓")
+    
+    # TEST 3: Cube C27
+    print("\n\n[TEST 3] Structure C27 et Ancrage")
+    print("-"*70)
+    
+    stats = moteur.analyser_cube_27()
+    print(f"\nCube 3×3×3:")
+    print(f"  Points: {stats['nombre_points']}")
+    print(f"  Paires d'ancrage valides: {stats['ancrages_valides']}/{stats['total_paires']}")
+    print(f"  Ratio: {stats['ratio_percentage']:.2f}%")
+    
+    # TEST 4: Application poétique
+    print("\n\n[TEST 4] Triade poétique")
+    print("-"*70)
+    
+    concepts = {
+        (1, 0, 0): "Interrogation",
+        (0, 1, 0): "Négation",
+        (0, 0, 1): "Affirmation"
+    }
+    
+    triade = moteur.generer_triade_poetique(
+        moteur.M_THESE,
+        moteur.M_ANTITHESE,
+        concepts
+    )
+    
+    print(f"\nConcept 1: {triade['concept_1']}")
+    print(f"Concept 2: {triade['concept_2']}")
+    print(f"État de tension: {triade['tension']}")
+    print(f"État de synthèse: {triade['synthese']}")
+    print(f"Équilibré? {triade['equilibre']} ✓")
+    
+    print("\n" + "="*70)
+    print("✓ Tous les tests réussis!")
+    print("="*70)